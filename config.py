@@ -1,3 +1,5 @@
+import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -24,9 +26,16 @@ class Settings(BaseSettings):
     debug: bool = False
     
     class Config:
-        env_file = ".env"
+        # Set ENV_FILE="" in production to read only real environment variables
+        env_file = os.getenv("ENV_FILE", ".env") or None
         case_sensitive = False
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings instance, parsing the environment only once."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
@@ -1,22 +1,97 @@
-from fastapi import FastAPI, HTTPException, Query, Depends
-from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, Depends
+from fastapi.responses import ORJSONResponse, Response
+from contextlib import asynccontextmanager, suppress
 import asyncio
-from datetime import datetime
-from typing import Optional
+import msgspec
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
 
-from config import settings
+from config import Settings, get_settings, settings
 from models import CacheItem, CacheResponse, HealthResponse, ErrorResponse
 from redis_client import redis_client
 
 
+class MsgspecResponse(Response):
+    """JSON response that encodes msgspec Structs without an intermediate dict."""
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def _openapi_response(struct: type) -> Dict[int, Dict[str, Any]]:
+    """OpenAPI `responses` entry documenting a msgspec Struct as the 200 response body."""
+    _, components = msgspec.json.schema_components((struct,))
+    return {200: {"content": {"application/json": {"schema": components[struct.__name__]}}}}
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+# Timestamp served by the liveness probe, refreshed once per second by
+# _refresh_cached_iso so the probe does no datetime work per request; it can
+# therefore be up to a second stale
+_cached_iso = _now_iso()
+
+
+async def _refresh_cached_iso():
+    """Update the cached liveness timestamp once per second."""
+    global _cached_iso
+    while True:
+        _cached_iso = _now_iso()
+        await asyncio.sleep(1)
+
+
+# Name and version cannot change after startup, so the root endpoint reads
+# them from module constants instead of the settings object on every call
+_APP_NAME = settings.app_name
+_APP_VERSION = settings.app_version
+
+
+# Redis health results are reused for this many seconds so that concurrent
+# /health and /health/ready probes share a single Redis round trip
+HEALTH_CACHE_TTL = 1.0
+_HEALTH_CACHE: Tuple[float, Optional[Dict[str, Any]]] = (0.0, None)
+_HEALTH_LOCK = asyncio.Lock()
+
+
+async def _cached_redis_health() -> Dict[str, Any]:
+    """Return the Redis health check result, refreshing it at most once per HEALTH_CACHE_TTL."""
+    global _HEALTH_CACHE
+    checked_at, result = _HEALTH_CACHE
+    if result is not None and time.monotonic() - checked_at < HEALTH_CACHE_TTL:
+        return result
+    
+    async with _HEALTH_LOCK:
+        # Another probe may have refreshed the result while we waited
+        checked_at, result = _HEALTH_CACHE
+        if result is not None and time.monotonic() - checked_at < HEALTH_CACHE_TTL:
+            return result
+        
+        result = await redis_client.health_check()
+        _HEALTH_CACHE = (time.monotonic(), result)
+        return result
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
     
+    # Warm up the Redis connection pool before serving traffic; a failure here
+    # aborts startup so readiness fails fast instead of every request erroring
+    await redis_client.connect()
+    
+    timestamp_refresher = asyncio.create_task(_refresh_cached_iso())
+    
     yield
     
-    redis_client.close()
+    timestamp_refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await timestamp_refresher
+    await redis_client.aclose()
 
 
 # Create FastAPI application
@@ -24,69 +99,91 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="A simple FastAPI application with Azure Redis cache integration and Application Insights",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for unhandled errors."""
-    return JSONResponse(
+    return MsgspecResponse(
         status_code=500,
         content=ErrorResponse(
             error="Internal Server Error",
             detail="An unexpected error occurred",
-            timestamp=datetime.utcnow().isoformat()
-        ).dict()
+            timestamp=_now_iso()
+        )
     )
 
 
-@app.get("/", response_model=dict)
+def _error(detail: Any, status_code: int = 500) -> ORJSONResponse:
+    """Build an error response with the same body shape as HTTPException, without raising."""
+    return ORJSONResponse(status_code=status_code, content={"detail": detail})
+
+
+@app.get("/")
 async def root():
     """Root endpoint with basic application information."""
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
+    return ORJSONResponse({
+        "name": _APP_NAME,
+        "version": _APP_VERSION,
         "status": "running",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "timestamp": _now_iso()
+    })
 
 
-@app.get("/cache/{key}", response_model=CacheResponse)
-async def get_cache_value(key: str):
-    """
-    Get value from Redis cache by key.
-    
-    Args:
-        key: The cache key to retrieve
-        
-    Returns:
-        CacheResponse with the cached value if found
-    """
+async def _lookup_cache(key: str) -> Response:
+    """Look up a key in Redis and build the CacheResponse shared by the GET endpoints."""
     try:
         
         value = await redis_client.get_value(key)
         
         if value is not None:
-            return CacheResponse(
+            return MsgspecResponse(CacheResponse(
                 key=key,
-                value=value,
+                value=value.decode(),
                 found=True,
                 message="Value retrieved successfully"
-            )
+            ))
         else:
-            return CacheResponse(
+            return MsgspecResponse(CacheResponse(
                 key=key,
                 found=False,
                 message="Key not found in cache"
-            )
+            ))
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get cache value: {str(e)}")
+        return _error(f"Failed to get cache value: {str(e)}")
+
+
+@app.get(
+    "/cache/{key}",
+    response_class=MsgspecResponse,
+    responses=_openapi_response(CacheResponse)
+)
+async def get_cache_value(key: str) -> Response:
+    """
+    Get value from Redis cache by key.
+    
+    Args:
+        key: The cache key to retrieve
+        
+    Returns:
+        CacheResponse with the cached value if found
+    """
+    return await _lookup_cache(key)
 
 
-@app.get("/cache", response_model=CacheResponse)
-async def get_default_cache_value(key: Optional[str] = Query(None, description="Cache key to retrieve")):
+@app.get(
+    "/cache",
+    response_class=MsgspecResponse,
+    responses=_openapi_response(CacheResponse)
+)
+async def get_default_cache_value(
+    key: Optional[str] = Query(None, description="Cache key to retrieve"),
+    settings: Settings = Depends(get_settings)
+) -> Response:
     """
     Get value from Redis cache. If no key is provided, uses the default key from environment.
     
@@ -98,11 +195,15 @@ async def get_default_cache_value(key: Optional[str] = Query(None, description="
     """
     cache_key = key if key is not None else settings.default_key
     
-    return await get_cache_value(cache_key)
+    return await _lookup_cache(cache_key)
 
 
-@app.post("/cache", response_model=CacheResponse)
-async def set_cache_value(item: CacheItem):
+@app.post(
+    "/cache",
+    response_class=MsgspecResponse,
+    responses=_openapi_response(CacheResponse)
+)
+async def set_cache_value(item: CacheItem) -> Response:
     """
     Store key-value pair in Redis cache.
     
@@ -116,21 +217,25 @@ async def set_cache_value(item: CacheItem):
         success = await redis_client.set_value(item.key, item.value, item.ttl)
         
         if success:
-            return CacheResponse(
+            return MsgspecResponse(CacheResponse(
                 key=item.key,
                 value=item.value,
                 found=True,
                 message="Value stored successfully"
-            )
+            ))
         else:
-            raise HTTPException(status_code=500, detail="Failed to store value in cache")
+            return _error("Failed to store value in cache")
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to set cache value: {str(e)}")
+        return _error(f"Failed to set cache value: {str(e)}")
 
 
-@app.delete("/cache/{key}", response_model=CacheResponse)
-async def delete_cache_value(key: str):
+@app.delete(
+    "/cache/{key}",
+    response_class=MsgspecResponse,
+    responses=_openapi_response(CacheResponse)
+)
+async def delete_cache_value(key: str) -> Response:
     """
     Delete value from Redis cache by key.
     
@@ -144,24 +249,28 @@ async def delete_cache_value(key: str):
         success = await redis_client.delete_value(key)
         
         if success:
-            return CacheResponse(
+            return MsgspecResponse(CacheResponse(
                 key=key,
                 found=True,
                 message="Value deleted successfully"
-            )
+            ))
         else:
-            return CacheResponse(
+            return MsgspecResponse(CacheResponse(
                 key=key,
                 found=False,
                 message="Key not found in cache"
-            )
+            ))
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to delete cache value: {str(e)}")
+        return _error(f"Failed to delete cache value: {str(e)}")
 
 
-@app.get("/health", response_model=HealthResponse)
-async def health_check():
+@app.get(
+    "/health",
+    response_class=MsgspecResponse,
+    responses=_openapi_response(HealthResponse)
+)
+async def health_check(settings: Settings = Depends(get_settings)) -> Response:
     """
     Health check endpoint that verifies the application and its dependencies.
     
@@ -171,14 +280,14 @@ async def health_check():
     try:
         
         # Check Redis health
-        redis_health = await redis_client.health_check()
+        redis_health = await _cached_redis_health()
         
         # Determine overall status
         overall_status = "healthy" if redis_health["status"] == "healthy" else "unhealthy"
         
-        response = HealthResponse(
+        response = MsgspecResponse(HealthResponse(
             status=overall_status,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=_now_iso(),
             version=settings.app_version,
             components={
                 "redis": redis_health,
@@ -188,22 +297,22 @@ async def health_check():
                     "version": settings.app_version
                 }
             }
-        )
+        ))
         
         return response
     
     except Exception as e:
-        return HealthResponse(
+        return MsgspecResponse(HealthResponse(
             status="unhealthy",
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=_now_iso(),
             version=settings.app_version,
             components={
                 "error": str(e)
             }
-        )
+        ))
 
 
-@app.get("/health/live", response_model=dict)
+@app.get("/health/live")
 async def liveness_check():
     """
     Liveness probe endpoint for Kubernetes/container orchestration.
@@ -212,13 +321,10 @@ async def liveness_check():
     Returns:
         Simple status response
     """
-    return {
-        "status": "alive",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return ORJSONResponse({"status": "alive", "timestamp": _cached_iso})
 
 
-@app.get("/health/ready", response_model=dict)
+@app.get("/health/ready")
 async def readiness_check():
     """
     Readiness probe endpoint for Kubernetes/container orchestration.
@@ -230,49 +336,56 @@ async def readiness_check():
     try:
         
         # Check if Redis is accessible
-        redis_health = await redis_client.health_check()
+        redis_health = await _cached_redis_health()
         is_ready = redis_health["status"] == "healthy"
         
         if is_ready:
-            return {
+            return ORJSONResponse({
                 "status": "ready",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _now_iso(),
                 "dependencies": {
                     "redis": "healthy"
                 }
-            }
+            })
         else:
-            raise HTTPException(
-                status_code=503,
-                detail={
+            return _error(
+                {
                     "status": "not_ready",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": _now_iso(),
                     "dependencies": {
                         "redis": "unhealthy"
                     }
-                }
+                },
+                status_code=503
             )
     
-    except HTTPException:
-        raise
     except Exception as e:
-        raise HTTPException(
-            status_code=503,
-            detail={
+        return _error(
+            {
                 "status": "not_ready",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _now_iso(),
                 "error": str(e)
-            }
+            },
+            status_code=503
         )
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     
+    # Reload mode only supports a single process; otherwise honour
+    # WEB_CONCURRENCY like the container does, falling back to half the cores.
+    # Each worker runs its own lifespan and therefore its own Redis pool.
+    workers = 1 if settings.debug else int(
+        os.getenv("WEB_CONCURRENCY") or max(1, (os.cpu_count() or 1) // 2)
+    )
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
+        workers=workers,
         reload=settings.debug,
         log_level="info"
     )
\ No newline at end of file
@@ -1,3 +1,4 @@
+import msgspec
 from pydantic import BaseModel, Field
 from typing import Optional
 
@@ -9,7 +10,7 @@ class CacheItem(BaseModel):
     ttl: Optional[int] = Field(None, description="Time to live in seconds", ge=1)
 
 
-class CacheResponse(BaseModel):
+class CacheResponse(msgspec.Struct):
     """Response model for cache operations."""
     key: str
     value: Optional[str] = None
@@ -17,15 +18,15 @@ class CacheResponse(BaseModel):
     message: str = ""
 
 
-class HealthResponse(BaseModel):
+class HealthResponse(msgspec.Struct):
     """Response model for health check endpoints."""
     status: str
     timestamp: str
     version: str
-    components: dict = {}
+    components: dict = msgspec.field(default_factory=dict)
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(msgspec.Struct):
     """Error response model."""
     error: str
     detail: str
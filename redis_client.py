@@ -1,15 +1,46 @@
-import redis
+import asyncio
+import redis.asyncio as aioredis
 import logging
+import threading
 import time
+from contextlib import suppress
 from typing import Optional, Dict, Any, Tuple, Union
 from azure.identity import DefaultAzureCredential
 from redis.credentials import CredentialProvider
 from config import settings
 
 
+logger = logging.getLogger(__name__)
+
+# Azure Redis Cache scope for Entra ID tokens
+REDIS_TOKEN_SCOPE = "https://redis.azure.com/.default"
+# Refresh tokens this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 600
+# Minimum wait between background refresh attempts
+TOKEN_REFRESH_RETRY_INTERVAL = 30
+
+
+# Process-wide Azure credential, created on first use so the credential chain
+# is discovered once and its token caches are shared by every provider
+_AZURE_CREDENTIAL: Optional[DefaultAzureCredential] = None
+_AZURE_CREDENTIAL_LOCK = threading.Lock()
+
+
+def _get_azure_credential() -> DefaultAzureCredential:
+    """Return the shared DefaultAzureCredential, creating it on first call."""
+    global _AZURE_CREDENTIAL
+    if _AZURE_CREDENTIAL is None:
+        with _AZURE_CREDENTIAL_LOCK:
+            if _AZURE_CREDENTIAL is None:
+                _AZURE_CREDENTIAL = DefaultAzureCredential()
+    return _AZURE_CREDENTIAL
+
+
 class EntraIDCredentialProvider(CredentialProvider):
     """Credential provider for Azure Entra ID authentication with Managed Identity."""
     
+    logger = logger
+    
     def __init__(self, username: str = "default"):
         """
         Initialize the Entra ID credential provider.
@@ -18,114 +49,171 @@ class EntraIDCredentialProvider(CredentialProvider):
             username: The username for Redis authentication (typically "default" or object ID)
         """
         self.username = username
-        self.credential = DefaultAzureCredential()
-        self.logger = logging.getLogger(__name__)
-        self._token = None
-        self._token_expiry = 0
+        self.credential = _get_azure_credential()
+        self._refresh_lock = threading.Lock()
+        # (credentials, expiry) is swapped as one tuple so readers never need the lock
+        self._state: Tuple[Optional[Tuple[str, str]], float] = (None, 0)
+    
+    @property
+    def token_expiry(self) -> float:
+        """Expiry of the current token as a POSIX timestamp (0 if none yet)."""
+        return self._state[1]
+    
+    def refresh_token(self) -> None:
+        """Fetch a new Entra ID token from Azure and store it for get_credentials."""
+        seen_expiry = self._state[1]
+        with self._refresh_lock:
+            if self._state[1] != seen_expiry:
+                # Another caller refreshed the token while we waited for the lock
+                return
+            try:
+                token = self.credential.get_token(REDIS_TOKEN_SCOPE)
+            except Exception as e:
+                self.logger.error("Failed to obtain Entra ID token: %s", e)
+                raise
+            self._state = ((self.username, token.token), token.expires_on)
+            self.logger.info("Successfully obtained new Entra ID token for Redis")
     
     def get_credentials(self) -> Union[Tuple[str], Tuple[str, str]]:
         """
         Get credentials for Redis authentication.
         Returns a tuple of (username, token) for Entra ID authentication.
+        
+        Tokens are normally kept fresh by RedisClient's background refresher;
+        a token is only fetched inline before the first refresh or if the
+        current one has already expired.
         """
-        # Refresh token if it's expired or about to expire (5 minutes buffer)
-        current_time = time.time()
-        if self._token is None or current_time >= (self._token_expiry - 300):
-            try:
-                # Azure Redis Cache scope
-                token = self.credential.get_token("https://redis.azure.com/.default")
-                self._token = token.token
-                self._token_expiry = token.expires_on
-                self.logger.info("Successfully obtained new Entra ID token for Redis")
-            except Exception as e:
-                self.logger.error(f"Failed to obtain Entra ID token: {str(e)}")
-                raise
+        credentials, expiry = self._state
+        if credentials is None or time.time() >= expiry:
+            self.refresh_token()
+            credentials, _ = self._state
         
-        return (self.username, self._token)
+        return credentials
 
 
 class RedisClient:
     """Redis client wrapper with connection management and error handling."""
     
-    def __init__(self):
-        self._client: Optional[redis.Redis] = None
-        self.logger = logging.getLogger(__name__)
+    logger = logger
     
-    def _get_client(self) -> redis.Redis:
-        """Get or create Redis client with proper configuration."""
+    def __init__(self, max_connections: int = 50, pool_timeout: int = 5):
+        self._client: Optional[aioredis.Redis] = None
+        self._pool: Optional[aioredis.ConnectionPool] = None
+        self._credential_provider: Optional[EntraIDCredentialProvider] = None
+        self._token_refresher: Optional[asyncio.Task] = None
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+    
+    async def connect(self) -> None:
+        """Create the Redis client and connection pool and verify connectivity."""
         if self._client is None:
             try:
                 # Common configuration for all Redis connections
                 redis_config = {
                     "host": settings.redis_host,
                     "port": settings.redis_port,
-                    "ssl": settings.redis_ssl,
                     "db": settings.redis_db,
-                    "decode_responses": True,
+                    # Values are returned as raw bytes and decoded by callers only when needed
+                    "decode_responses": False,
                     "socket_connect_timeout": 5,
                     "socket_timeout": 5,
                     "retry_on_timeout": True,
-                    "health_check_interval": 30
+                    "health_check_interval": 30,
+                    "max_connections": self.max_connections,
+                    "timeout": self.pool_timeout
                 }
                 
+                if settings.redis_ssl:
+                    redis_config["connection_class"] = aioredis.SSLConnection
+                
                 # Add authentication-specific configuration
                 if settings.redis_use_entraid:
                     self.logger.info("Configuring Redis client with Entra ID authentication")
-                    credential_provider = EntraIDCredentialProvider(username=settings.redis_username)
-                    redis_config["credential_provider"] = credential_provider
+                    self._credential_provider = EntraIDCredentialProvider(username=settings.redis_username)
+                    redis_config["credential_provider"] = self._credential_provider
                 else:
                     self.logger.info("Configuring Redis client with password authentication")
                     redis_config["password"] = settings.redis_password
                 
-                self._client = redis.Redis(**redis_config)
+                # Requests wait up to pool_timeout for a free connection instead of
+                # failing immediately once max_connections are in use
+                self._pool = aioredis.BlockingConnectionPool(**redis_config)
+                client = aioredis.Redis(connection_pool=self._pool)
                 
                 # Test connection
-                self._client.ping()
+                await client.ping()
+                self._client = client
                 self.logger.info("Redis connection established successfully")
+                
+                if self._credential_provider is not None:
+                    self._token_refresher = asyncio.create_task(
+                        self._refresh_token_periodically(self._credential_provider)
+                    )
             except Exception as e:
-                self.logger.error(f"Failed to connect to Redis: {str(e)}")
+                if self._pool:
+                    await self._pool.disconnect()
+                    self._pool = None
+                self._credential_provider = None
+                self.logger.error("Failed to connect to Redis: %s", e)
                 raise
-        return self._client
     
-    async def get_value(self, key: str) -> Optional[str]:
-        """Get value from Redis cache."""
+    async def _refresh_token_periodically(self, provider: EntraIDCredentialProvider) -> None:
+        """Refresh the Entra ID token ahead of expiry so requests never wait on Azure."""
+        while True:
+            delay = provider.token_expiry - time.time() - TOKEN_REFRESH_MARGIN
+            await asyncio.sleep(max(delay, TOKEN_REFRESH_RETRY_INTERVAL))
+            if provider.token_expiry - time.time() > TOKEN_REFRESH_MARGIN:
+                continue
+            try:
+                await asyncio.to_thread(provider.refresh_token)
+            except Exception:
+                # Already logged by refresh_token; retry after the next interval
+                pass
+    
+    async def get_value(self, key: str) -> Optional[bytes]:
+        """Get the raw value bytes from Redis cache."""
         try:
-            client = self._get_client()
-            value = client.get(key)
-            self.logger.info(f"Retrieved key '{key}' from Redis")
+            value = await self._client.get(key)
+            self.logger.info("Retrieved key '%s' from Redis", key)
             return value
         except Exception as e:
-            self.logger.error(f"Error getting key '{key}' from Redis: {str(e)}")
+            self.logger.error("Error getting key '%s' from Redis: %s", key, e)
             raise
     
-    async def set_value(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+    async def set_value(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> bool:
         """Set value in Redis cache with optional TTL."""
         try:
-            client = self._get_client()
-            result = client.set(key, value, ex=ttl)
-            self.logger.info(f"Set key '{key}' in Redis with TTL: {ttl}")
+            if ttl:
+                result = await self._client.setex(key, ttl, value)
+            else:
+                result = await self._client.set(key, value)
+            self.logger.info("Set key '%s' in Redis with TTL: %s", key, ttl)
             return result
         except Exception as e:
-            self.logger.error(f"Error setting key '{key}' in Redis: {str(e)}")
+            self.logger.error("Error setting key '%s' in Redis: %s", key, e)
             raise
     
     async def delete_value(self, key: str) -> bool:
         """Delete value from Redis cache."""
         try:
-            client = self._get_client()
-            result = client.delete(key) > 0
-            self.logger.info(f"Deleted key '{key}' from Redis")
+            result = await self._client.delete(key) > 0
+            self.logger.info("Deleted key '%s' from Redis", key)
             return result
         except Exception as e:
-            self.logger.error(f"Error deleting key '{key}' from Redis: {str(e)}")
+            self.logger.error("Error deleting key '%s' from Redis: %s", key, e)
             raise
     
     async def health_check(self) -> Dict[str, Any]:
         """Check Redis connection health."""
         try:
-            client = self._get_client()
-            ping_result = client.ping()
-            info = client.info()
+            # Send PING and only the INFO sections we report in one round trip
+            async with self._client.pipeline(transaction=False) as pipe:
+                pipe.ping()
+                pipe.info("server")
+                pipe.info("clients")
+                pipe.info("memory")
+                ping_result, server_info, clients_info, memory_info = await pipe.execute()
+            info = {**server_info, **clients_info, **memory_info}
             
             return {
                 "status": "healthy" if ping_result else "unhealthy",
@@ -135,19 +223,29 @@ class RedisClient:
                 "redis_version": info.get("redis_version", "unknown")
             }
         except Exception as e:
-            self.logger.error(f"Redis health check failed: {str(e)}")
+            self.logger.error("Redis health check failed: %s", e)
             return {
                 "status": "unhealthy",
                 "error": str(e)
             }
     
-    def close(self):
-        """Close Redis connection."""
+    async def aclose(self):
+        """Close Redis client and disconnect the connection pool."""
+        if self._token_refresher:
+            self._token_refresher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._token_refresher
+            self._token_refresher = None
+        self._credential_provider = None
         if self._client:
-            self._client.close()
+            await self._client.aclose()
             self._client = None
+        if self._pool:
+            await self._pool.disconnect()
+            self._pool = None
             self.logger.info("Redis connection closed")
 
 
-# Global Redis client instance
+# Global Redis client instance; its connection pool is shared by every request
+# handled in this process
 redis_client = RedisClient()
\ No newline at end of file